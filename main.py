@@ -13,10 +13,14 @@ from src.config import (
     KEYWORDS,
     RSS_FEEDS,
     NEWSAPI_KEY,
+    NEWSAPI_DOMAINS,
+    NEWSAPI_TITLE_ONLY,
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHAT_ID,
     TIMEZONE,
     STORAGE_PATH,
+    FEED_VALIDATORS_PATH,
+    STORAGE_BACKEND,
     RSS_FETCH_TIMEOUT,
     FETCH_WINDOW_HOURS,
     MAX_ARTICLES_IN_DIGEST,
@@ -25,7 +29,7 @@ from src.config import (
 from src.news_fetcher import NewsFetcher
 from src.keyword_matcher import KeywordMatcher
 from src.telegram_notifier import TelegramNotifier
-from src.storage import ArticleStorage
+from src.storage import ArticleStorage, BloomArticleStorage
 
 # Configure logging
 logging.basicConfig(
@@ -40,27 +44,43 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Main execution flow."""
+    notifier = None
+    fetcher = None
+    # Feed validators are only saved once everything fetched in this run is handled
+    save_feed_validators = False
+
     try:
         logger.info("=" * 60)
         logger.info("Starting AI News Alerts check...")
-        logger.info(f"Time: {datetime.now()}")
+        logger.info("Time: %s", datetime.now())
         logger.info("=" * 60)
 
         # 1. Initialize components
         logger.info("Initializing components...")
-        storage = ArticleStorage(STORAGE_PATH)
-        fetcher = NewsFetcher(RSS_FEEDS, NEWSAPI_KEY, timeout=RSS_FETCH_TIMEOUT)
+        if STORAGE_BACKEND == "bloom":
+            storage = BloomArticleStorage(STORAGE_PATH)
+        else:
+            storage = ArticleStorage(STORAGE_PATH)
+        fetcher = NewsFetcher(
+            RSS_FEEDS,
+            NEWSAPI_KEY,
+            timeout=RSS_FETCH_TIMEOUT,
+            newsapi_domains=NEWSAPI_DOMAINS,
+            newsapi_title_only=NEWSAPI_TITLE_ONLY,
+            feed_validators_path=FEED_VALIDATORS_PATH
+        )
         matcher = KeywordMatcher(KEYWORDS)
         notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TIMEZONE)
 
         # Log storage stats
         stats = storage.get_stats()
-        logger.info(f"Storage stats: {stats['total']} articles tracked")
+        logger.info("Storage stats: %s articles tracked", stats['total'])
 
         # 2. Fetch articles from all sources
-        logger.info(f"Fetching articles from the last {FETCH_WINDOW_HOURS} hours...")
+        logger.info("Fetching articles from the last %s hours...", FETCH_WINDOW_HOURS)
         all_articles = fetcher.fetch_all_articles(KEYWORDS, hours_ago=FETCH_WINDOW_HOURS)
-        logger.info(f"Fetched {len(all_articles)} total articles")
+        logger.info("Fetched %d total articles", len(all_articles))
+        save_feed_validators = True
 
         if not all_articles:
             logger.info("No articles found from any source")
@@ -69,23 +89,16 @@ def main():
         # 3. Filter by keywords
         logger.info("Filtering articles by keywords...")
         matched_articles = matcher.filter_articles(all_articles)
-        logger.info(f"Found {len(matched_articles)} articles matching keywords")
+        logger.info("Found %d articles matching keywords", len(matched_articles))
 
         if not matched_articles:
             logger.info("No articles matched the configured keywords")
             return
 
-        # Log keyword statistics
-        keyword_stats = matcher.get_keyword_stats(matched_articles)
-        logger.info(f"Keyword match stats: {keyword_stats}")
-
         # 4. Filter out already sent articles
         logger.info("Checking for new articles (filtering out already sent)...")
-        new_articles = [
-            article for article in matched_articles
-            if not storage.is_sent(article['url'])
-        ]
-        logger.info(f"Found {len(new_articles)} new articles (not previously sent)")
+        new_articles = storage.filter_unsent(matched_articles)
+        logger.info("Found %d new articles (not previously sent)", len(new_articles))
 
         if not new_articles:
             logger.info("No new articles to send - all matching articles were already sent")
@@ -96,11 +109,20 @@ def main():
 
         # 6. Take top N articles for digest
         articles_to_send = new_articles[:MAX_ARTICLES_IN_DIGEST]
-        logger.info(f"Preparing digest with top {len(articles_to_send)} articles")
+        logger.info("Preparing digest with top %d articles", len(articles_to_send))
+
+        # Articles left for the next digest must be fetched again, so no 304s next run
+        if len(new_articles) > len(articles_to_send):
+            save_feed_validators = False
+
+        # Log keyword statistics for the articles in the digest
+        matcher.add_matched_keywords(articles_to_send)
+        keyword_stats = matcher.get_keyword_stats(articles_to_send)
+        logger.info("Keyword match stats: %s", keyword_stats)
 
         # Log article details
         for idx, article in enumerate(articles_to_send, 1):
-            logger.info(f"  {idx}. {article['title'][:80]}... ({article['source']})")
+            logger.info("  %d. %.80s... (%s)", idx, article['title'], article['source'])
 
         # 7. Send digest notification
         logger.info("Sending Telegram digest...")
@@ -110,15 +132,16 @@ def main():
             # 8. Mark articles as sent
             logger.info("Marking articles as sent...")
             storage.mark_multiple_as_sent(articles_to_send)
-            logger.info(f"Successfully sent and tracked {len(articles_to_send)} articles")
+            logger.info("Successfully sent and tracked %d articles", len(articles_to_send))
         else:
             logger.error("Failed to send Telegram notification - articles NOT marked as sent")
+            save_feed_validators = False
 
         # 9. Cleanup old entries
-        logger.info(f"Cleaning up entries older than {CLEANUP_DAYS} days...")
+        logger.info("Cleaning up entries older than %s days...", CLEANUP_DAYS)
         removed = storage.cleanup_old_entries(days=CLEANUP_DAYS)
         if removed > 0:
-            logger.info(f"Removed {removed} old entries")
+            logger.info("Removed %s old entries", removed)
 
         logger.info("=" * 60)
         logger.info("AI News Alerts check completed successfully")
@@ -126,20 +149,29 @@ def main():
 
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
+        save_feed_validators = False
         sys.exit(0)
 
     except Exception as e:
-        logger.error(f"Error in main execution: {e}", exc_info=True)
+        logger.error("Error in main execution: %s", e, exc_info=True)
+        save_feed_validators = False
 
         # Optionally send error notification to Telegram
         try:
-            notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TIMEZONE)
+            if notifier is None:
+                notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TIMEZONE)
             notifier.send_error_notification(f"Critical error: {str(e)}")
         except:
             pass
 
         sys.exit(1)
 
+    finally:
+        if fetcher is not None and save_feed_validators:
+            fetcher.save_feed_validators()
+        if notifier is not None:
+            notifier.close()
+
 
 if __name__ == "__main__":
     main()
@@ -36,12 +36,20 @@ TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
 TIMEZONE: str = "America/Lima"
 
 # Storage configuration
-STORAGE_PATH: str = "data/sent_articles.json"
+STORAGE_PATH: str = "data/sent_articles.jsonl"
+# "json" keeps exact per-article records, "bloom" uses compact Bloom filters
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "json")
+# ETag / Last-Modified of each RSS feed, so unchanged feeds answer 304 on the next run
+FEED_VALIDATORS_PATH: str = "data/feed_validators.json"
 
 # API Rate Limits
 NEWSAPI_MAX_REQUESTS: int = 100  # Free tier daily limit
 RSS_FETCH_TIMEOUT: int = 10  # seconds
 
+# NewsAPI query narrowing (applied server-side)
+NEWSAPI_DOMAINS: List[str] = []  # e.g. ["techcrunch.com", "theverge.com"]; empty searches all sources
+NEWSAPI_TITLE_ONLY: bool = False  # Use qInTitle to match keywords in titles only
+
 # Fetch window (hours to look back for articles)
 FETCH_WINDOW_HOURS: int = 8
 
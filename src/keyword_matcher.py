@@ -1,15 +1,34 @@
 """
 Keyword matching module for filtering articles.
-Uses regex with word boundaries for accurate matching.
+Uses an Aho-Corasick automaton (or regex as fallback) with word boundaries
+for accurate matching.
 """
 
 import re
 import logging
-from typing import List, Dict, Set
+from collections import Counter
+from typing import List, Dict, Iterator, Optional, Set
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
 
+def _is_word_char(char: str) -> bool:
+    """Return True if char would count as a word character for regex \\b."""
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text: str, pos: int) -> bool:
+    """Return True if regex \\b would match at pos in text."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
 class KeywordMatcher:
     """Matches articles against configured keywords."""
 
@@ -22,15 +41,38 @@ class KeywordMatcher:
         """
         self.keywords = keywords
 
-        # Compile regex patterns for efficient matching
-        # Use word boundaries to avoid partial matches
-        # Case-insensitive matching
-        self.patterns = [
-            re.compile(r'\b' + re.escape(kw) + r'\b', re.IGNORECASE)
-            for kw in keywords
-        ]
+        # Map lowercased hits back to the keyword's original case
+        self._canon = {kw.lower(): kw for kw in keywords}
 
-        logger.info(f"Initialized keyword matcher with {len(keywords)} keywords")
+        # Compile a single pattern so each article is scanned once
+        # Use word boundaries to avoid partial matches
+        # Zero-width lookaheads keep overlapping keywords (e.g. "agentic AI agents"):
+        # the alternation finds positions where some keyword starts, then one
+        # optional capturing lookahead per keyword reports every keyword starting
+        # there, so nested keywords ("agent" / "agent SDK") are all found
+        # Case-insensitive via lowercase keywords matched against lowercased text,
+        # which avoids case folding inside the regex engine
+        self._group_keywords = sorted(self._canon, key=len, reverse=True)
+        alternation = '|'.join(re.escape(kw) for kw in self._group_keywords)
+        captures = ''.join(r'(?:(?=(' + re.escape(kw) + r')\b))?' for kw in self._group_keywords)
+        self._combined = re.compile(r'\b(?=(?:' + alternation + r')\b)' + captures)
+
+        # Prefer an Aho-Corasick automaton when pyahocorasick is installed:
+        # all keywords are matched in one linear pass with no backtracking
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                self._automaton.add_word(kw.lower(), (len(kw.lower()), kw))
+            self._automaton.make_automaton()
+
+        logger.info("Initialized keyword matcher with %d keywords", len(keywords))
+
+    def _article_text(self, article: Dict) -> str:
+        """Combine title and description into the lowercased text that gets searched."""
+        # Skip empty parts (e.g. RSS items without a description)
+        parts = [part for part in (article.get('title', ''), article.get('description', '')) if part]
+        return ' '.join(parts).lower()
 
     def find_matches(self, article: Dict) -> Set[str]:
         """
@@ -42,45 +84,92 @@ class KeywordMatcher:
         Returns:
             Set of matched keywords (preserves original case from keywords list)
         """
-        # Combine title and description for searching
-        title = article.get('title', '')
-        description = article.get('description', '')
-        text = f"{title} {description}"
+        text = self._article_text(article)
+
+        if self._automaton is not None:
+            return set(self._iter_automaton_matches(text))
+
+        # Single pass over the text, mapping captured hits to canonical keywords
+        return {
+            self._canon[hit]
+            for match in self._combined.finditer(text)
+            for hit in match.groups()
+            if hit is not None
+        }
+
+    def search_any(self, article: Dict) -> Optional[str]:
+        """
+        Find the first matching keyword, stopping as soon as one is found.
+
+        Args:
+            article: Article dictionary with 'title' and 'description' keys
+
+        Returns:
+            First matched keyword, or None if the article matches nothing
+        """
+        text = self._article_text(article)
 
-        matched_keywords = set()
+        if self._automaton is not None:
+            return next(self._iter_automaton_matches(text), None)
 
-        # Check each pattern against the text
-        for pattern, keyword in zip(self.patterns, self.keywords):
-            if pattern.search(text):
-                matched_keywords.add(keyword)
+        match = self._combined.search(text)
+        if match:
+            # Longest keyword starting at the first hit position
+            return self._canon[next(hit for hit in match.groups() if hit is not None)]
+        return None
 
-        return matched_keywords
+    def _iter_automaton_matches(self, text: str) -> Iterator[str]:
+        """
+        Yield matching keywords using the Aho-Corasick automaton.
+
+        Args:
+            text: Lowercased text to search
+
+        Yields:
+            Matched keywords that sit on word boundaries (may repeat)
+        """
+        for end, (length, keyword) in self._automaton.iter(text):
+            start = end - length + 1
+
+            # Emulate the regex fallback's \b on both sides of the hit
+            if _at_word_boundary(text, start) and _at_word_boundary(text, end + 1):
+                yield keyword
 
     def filter_articles(self, articles: List[Dict]) -> List[Dict]:
         """
         Filter articles that match any keyword.
-        Enriches each article with 'matched_keywords' field.
+        Only checks for a first match; use add_matched_keywords to enrich
+        the articles that are actually reported.
 
         Args:
             articles: List of article dictionaries
 
         Returns:
-            List of articles that match at least one keyword,
-            with 'matched_keywords' field added
+            List of articles that match at least one keyword
         """
-        filtered_articles = []
+        filtered_articles = [
+            article for article in articles
+            if self.search_any(article) is not None
+        ]
 
-        for article in articles:
-            matched_keywords = self.find_matches(article)
+        logger.info("Filtered %d matching articles from %d total", len(filtered_articles), len(articles))
 
-            if matched_keywords:
-                # Add matched keywords to article
-                article['matched_keywords'] = list(matched_keywords)
-                filtered_articles.append(article)
+        return filtered_articles
 
-        logger.info(f"Filtered {len(filtered_articles)} matching articles from {len(articles)} total")
+    def add_matched_keywords(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Enrich each article with a 'matched_keywords' field listing all matches.
 
-        return filtered_articles
+        Args:
+            articles: List of article dictionaries
+
+        Returns:
+            The same list, with 'matched_keywords' field added to each article
+        """
+        for article in articles:
+            article['matched_keywords'] = list(self.find_matches(article))
+
+        return articles
 
     def get_keyword_stats(self, articles: List[Dict]) -> Dict[str, int]:
         """
@@ -92,12 +181,5 @@ class KeywordMatcher:
         Returns:
             Dictionary mapping keywords to match counts
         """
-        stats = {kw: 0 for kw in self.keywords}
-
-        for article in articles:
-            matched_keywords = article.get('matched_keywords', [])
-            for kw in matched_keywords:
-                if kw in stats:
-                    stats[kw] += 1
-
-        return stats
+        counts = Counter(kw for article in articles for kw in article.get('matched_keywords', ()))
+        return {kw: counts.get(kw, 0) for kw in self.keywords}
@@ -4,29 +4,91 @@ Handles fetching, parsing, and normalizing articles from multiple sources.
 """
 
 import logging
-from datetime import datetime, timedelta
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import List, Dict, Optional
-import pytz
 
 import feedparser
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from newsapi import NewsApiClient
 from dateutil import parser as date_parser
 
+from src.url_utils import canonical_url
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
 logger = logging.getLogger(__name__)
 
+UTC = timezone.utc
+
+# Matches HTML tags to strip from RSS descriptions
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
 
 class RSSFetcher:
     """Fetches and parses RSS feeds."""
 
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, validators_path: Optional[str] = None):
         """
         Initialize RSS fetcher.
 
         Args:
             timeout: Timeout in seconds for feed requests
+            validators_path: Optional JSON file persisting ETag / Last-Modified
+                validators between runs
         """
         self.timeout = timeout
+        self.validators_path = Path(validators_path) if validators_path else None
+
+        # Pooled session reuses TCP/TLS connections across feeds
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = feedparser.USER_AGENT
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Per-feed ETag / Last-Modified validators for conditional requests
+        self._validators: Dict[str, Dict[str, str]] = self._load_validators()
+
+    def _load_validators(self) -> Dict[str, Dict[str, str]]:
+        """Load validators saved by a previous run, if any."""
+        if self.validators_path is None:
+            return {}
+
+        try:
+            return orjson.loads(self.validators_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error("Error loading feed validators from %s: %s", self.validators_path, e)
+            return {}
+
+    def save_validators(self) -> None:
+        """
+        Persist the current validators so the next run can send conditional requests.
+        Writes to a temporary file first and atomically replaces the original.
+        """
+        if self.validators_path is None:
+            return
+
+        tmp_path = self.validators_path.with_name(self.validators_path.name + '.tmp')
+
+        try:
+            self.validators_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(self._validators, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, self.validators_path)
+            logger.debug("Saved validators for %d feeds", len(self._validators))
+        except Exception as e:
+            logger.error("Error saving feed validators: %s", e)
 
     def fetch_feed(self, feed_url: str, source_name: str, hours_ago: int = 8) -> List[Dict]:
         """
@@ -43,46 +105,74 @@ class RSSFetcher:
         articles = []
 
         try:
-            logger.info(f"Fetching RSS feed: {source_name}")
-
-            # Parse the feed
-            feed = feedparser.parse(feed_url)
+            logger.info("Fetching RSS feed: %s", source_name)
+
+            # Download with an enforced timeout, sending cached validators
+            headers = {}
+            validators = self._validators.get(feed_url, {})
+            if 'ETag' in validators:
+                headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                headers['If-Modified-Since'] = validators['Last-Modified']
+
+            response = self.session.get(feed_url, headers=headers, timeout=self.timeout)
+
+            if response.status_code == 304:
+                logger.info("Feed %s not modified since last fetch", source_name)
+                return articles
+
+            response.raise_for_status()
+
+            self._validators[feed_url] = {
+                name: response.headers[name]
+                for name in ('ETag', 'Last-Modified')
+                if name in response.headers
+            }
+
+            # Parse the feed, passing headers on so feedparser still sees the
+            # charset and the base URI for resolving relative links
+            feed = feedparser.parse(
+                response.content,
+                response_headers={**response.headers, 'content-location': response.url}
+            )
 
             if feed.bozo:
-                logger.warning(f"Feed {source_name} may be malformed: {feed.bozo_exception}")
+                logger.warning("Feed %s may be malformed: %s", source_name, feed.bozo_exception)
 
-            # Calculate cutoff time
-            cutoff_time = datetime.now(pytz.UTC) - timedelta(hours=hours_ago)
+            # Snapshot current time once per feed for the cutoff and missing dates
+            now = datetime.now(UTC)
+            cutoff_time = now - timedelta(hours=hours_ago)
 
             # Process entries
             for entry in feed.entries:
                 try:
-                    article = self._normalize_entry(entry, source_name)
+                    article = self._normalize_entry(entry, source_name, now_utc=now)
 
                     # Filter by publication date
                     if article and article['published'] >= cutoff_time:
                         articles.append(article)
 
                 except Exception as e:
-                    logger.warning(f"Error processing RSS entry: {e}")
+                    logger.warning("Error processing RSS entry: %s", e)
                     continue
 
-            logger.info(f"Fetched {len(articles)} recent articles from {source_name}")
+            logger.info("Fetched %d recent articles from %s", len(articles), source_name)
 
         except requests.Timeout:
-            logger.warning(f"Timeout fetching RSS feed: {source_name}")
+            logger.warning("Timeout fetching RSS feed: %s", source_name)
         except Exception as e:
-            logger.error(f"Error fetching RSS feed {source_name}: {e}")
+            logger.error("Error fetching RSS feed %s: %s", source_name, e)
 
         return articles
 
-    def _normalize_entry(self, entry, source_name: str) -> Optional[Dict]:
+    def _normalize_entry(self, entry, source_name: str, now_utc: Optional[datetime] = None) -> Optional[Dict]:
         """
         Normalize RSS entry to standard article format.
 
         Args:
             entry: RSS feed entry
             source_name: Name of the source
+            now_utc: Current UTC time used when the entry has no date
 
         Returns:
             Normalized article dictionary or None if invalid
@@ -99,26 +189,32 @@ class RSSFetcher:
         description = entry.get('summary', '') or entry.get('description', '')
         # Strip HTML tags from description if present
         if description:
-            import re
-            description = re.sub(r'<[^>]+>', '', description)
-            description = description.strip()
+            description = _HTML_TAG_RE.sub('', description).strip()
 
         # Parse publication date
         published = None
+        pub_date_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
         pub_date_str = entry.get('published', '') or entry.get('updated', '')
 
-        if pub_date_str:
+        if pub_date_parsed:
+            # feedparser already normalized the date to a UTC struct_time
+            published = datetime(*pub_date_parsed[:6], tzinfo=UTC)
+        elif pub_date_str:
             try:
-                published = date_parser.parse(pub_date_str)
+                # RSS dates are RFC 822; fall back to dateutil for anything else
+                try:
+                    published = parsedate_to_datetime(pub_date_str)
+                except (TypeError, ValueError):
+                    published = date_parser.parse(pub_date_str)
                 # Ensure timezone aware
                 if published.tzinfo is None:
-                    published = pytz.UTC.localize(published)
+                    published = published.replace(tzinfo=UTC)
             except Exception as e:
-                logger.debug(f"Could not parse date '{pub_date_str}': {e}")
+                logger.debug("Could not parse date '%s': %s", pub_date_str, e)
 
         # Default to current time if no date found
         if not published:
-            published = datetime.now(pytz.UTC)
+            published = now_utc or datetime.now(UTC)
 
         return {
             'url': url,
@@ -132,13 +228,18 @@ class RSSFetcher:
 class NewsAPIFetcher:
     """Fetches articles from NewsAPI."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, domains: Optional[List[str]] = None, title_only: bool = False):
         """
         Initialize NewsAPI fetcher.
 
         Args:
             api_key: NewsAPI key
+            domains: Optional list of domains to restrict the search to (server-side)
+            title_only: Match keywords in article titles only (qInTitle)
         """
+        self.domains = ','.join(domains) if domains else None
+        self.title_only = title_only
+
         if not api_key:
             logger.warning("NewsAPI key not provided, NewsAPI fetching will be skipped")
             self.client = None
@@ -168,13 +269,16 @@ class NewsAPIFetcher:
             # Build query string: combine keywords with OR
             query = ' OR '.join(f'"{kw}"' for kw in keywords)
 
-            # Calculate date range
-            from_date = datetime.now() - timedelta(hours=hours_ago)
+            # Calculate date range in UTC (NewsAPI interprets from_param as UTC)
+            from_date = datetime.now(UTC) - timedelta(hours=hours_ago)
 
             # Query NewsAPI (using everything endpoint for free tier)
             response = self.client.get_everything(
-                q=query,
-                from_param=from_date.isoformat(),
+                q=None if self.title_only else query,
+                qintitle=query if self.title_only else None,
+                domains=self.domains,
+                # newsapi-python only accepts YYYY-MM-DDTHH:MM:SS (no offset or 'Z')
+                from_param=from_date.strftime('%Y-%m-%dT%H:%M:%S'),
                 language='en',
                 sort_by='publishedAt',
                 page_size=100  # Maximum for free tier
@@ -188,15 +292,15 @@ class NewsAPIFetcher:
                         if article:
                             articles.append(article)
                     except Exception as e:
-                        logger.warning(f"Error processing NewsAPI article: {e}")
+                        logger.warning("Error processing NewsAPI article: %s", e)
                         continue
 
-                logger.info(f"Fetched {len(articles)} articles from NewsAPI")
+                logger.info("Fetched %d articles from NewsAPI", len(articles))
             else:
-                logger.warning(f"NewsAPI response status: {response['status']}")
+                logger.warning("NewsAPI response status: %s", response['status'])
 
         except Exception as e:
-            logger.error(f"Error fetching from NewsAPI: {e}")
+            logger.error("Error fetching from NewsAPI: %s", e)
 
         return articles
 
@@ -227,16 +331,23 @@ class NewsAPIFetcher:
 
         if pub_date_str:
             try:
-                published = date_parser.parse(pub_date_str)
+                # NewsAPI dates are ISO 8601; fall back to dateutil for anything else
+                try:
+                    if ciso8601 is not None:
+                        published = ciso8601.parse_datetime(pub_date_str)
+                    else:
+                        published = datetime.fromisoformat(pub_date_str)
+                except ValueError:
+                    published = date_parser.parse(pub_date_str)
                 # Ensure timezone aware
                 if published.tzinfo is None:
-                    published = pytz.UTC.localize(published)
+                    published = published.replace(tzinfo=UTC)
             except Exception as e:
-                logger.debug(f"Could not parse date '{pub_date_str}': {e}")
+                logger.debug("Could not parse date '%s': %s", pub_date_str, e)
 
         # Default to current time if no date found
         if not published:
-            published = datetime.now(pytz.UTC)
+            published = datetime.now(UTC)
 
         # Extract source name
         source_name = article_data.get('source', {}).get('name', 'NewsAPI')
@@ -253,7 +364,15 @@ class NewsAPIFetcher:
 class NewsFetcher:
     """Orchestrates fetching from all news sources."""
 
-    def __init__(self, rss_feeds: Dict[str, str], newsapi_key: str, timeout: int = 10):
+    def __init__(
+        self,
+        rss_feeds: Dict[str, str],
+        newsapi_key: str,
+        timeout: int = 10,
+        newsapi_domains: Optional[List[str]] = None,
+        newsapi_title_only: bool = False,
+        feed_validators_path: Optional[str] = None
+    ):
         """
         Initialize news fetcher with all sources.
 
@@ -261,9 +380,16 @@ class NewsFetcher:
             rss_feeds: Dictionary mapping source names to RSS feed URLs
             newsapi_key: NewsAPI key
             timeout: Timeout for RSS requests
+            newsapi_domains: Optional list of domains to restrict NewsAPI results to
+            newsapi_title_only: Match NewsAPI keywords in titles only
+            feed_validators_path: Optional file persisting RSS conditional-request validators
         """
-        self.rss_fetcher = RSSFetcher(timeout=timeout)
-        self.newsapi_fetcher = NewsAPIFetcher(api_key=newsapi_key)
+        self.rss_fetcher = RSSFetcher(timeout=timeout, validators_path=feed_validators_path)
+        self.newsapi_fetcher = NewsAPIFetcher(
+            api_key=newsapi_key,
+            domains=newsapi_domains,
+            title_only=newsapi_title_only
+        )
         self.rss_feeds = rss_feeds
 
     def fetch_all_articles(self, keywords: List[str], hours_ago: int = 8) -> List[Dict]:
@@ -279,25 +405,33 @@ class NewsFetcher:
         """
         all_articles = []
 
-        # Fetch from all RSS feeds
-        for source_name, feed_url in self.rss_feeds.items():
-            articles = self.rss_fetcher.fetch_feed(feed_url, source_name, hours_ago)
-            all_articles.extend(articles)
+        # Fetch from all RSS feeds and NewsAPI concurrently (network bound)
+        with ThreadPoolExecutor(max_workers=len(self.rss_feeds) + 1) as executor:
+            futures = [
+                executor.submit(self.rss_fetcher.fetch_feed, feed_url, source_name, hours_ago)
+                for source_name, feed_url in self.rss_feeds.items()
+            ]
+            futures.append(executor.submit(self.newsapi_fetcher.fetch_articles, keywords, hours_ago))
 
-        # Fetch from NewsAPI
-        newsapi_articles = self.newsapi_fetcher.fetch_articles(keywords, hours_ago)
-        all_articles.extend(newsapi_articles)
+            # Collect in submission order so deduplication stays deterministic
+            for future in futures:
+                all_articles.extend(future.result())
 
-        # Deduplicate by URL
-        seen_urls = set()
-        unique_articles = []
+        # Deduplicate by canonical URL, keeping the first occurrence and original order
+        # (building from the reversed list lets earlier articles win the last write)
+        canonical_urls = [canonical_url(a['url']) for a in all_articles]
+        first_by_url = dict(zip(reversed(canonical_urls), reversed(all_articles)))
+        unique_articles = [first_by_url[url] for url in dict.fromkeys(canonical_urls)]
 
-        for article in all_articles:
-            url = article['url']
-            if url not in seen_urls:
-                seen_urls.add(url)
-                unique_articles.append(article)
-
-        logger.info(f"Total articles fetched: {len(unique_articles)} (deduplicated from {len(all_articles)})")
+        logger.info("Total articles fetched: %d (deduplicated from %d)", len(unique_articles), len(all_articles))
 
         return unique_articles
+
+    def save_feed_validators(self) -> None:
+        """
+        Persist RSS validators from this fetch.
+
+        Only call this once every fetched article has been handled, since feeds
+        that answer 304 next time won't return their articles again.
+        """
+        self.rss_fetcher.save_validators()
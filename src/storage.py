@@ -1,28 +1,50 @@
 """
 Storage module for tracking sent articles.
-Uses JSON file to persist article data between runs.
+Uses an append-only JSONL file to persist article data between runs, or
+optionally a pair of rotating Bloom filters for compact membership checks.
 """
 
-import json
 import logging
+import os
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import orjson
+
+from src.url_utils import canonical_url
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
 
 logger = logging.getLogger(__name__)
 
 
+def _to_timestamp(sent_at) -> float:
+    """Convert a stored 'sent_at' value (Unix epoch or legacy ISO string) to epoch seconds."""
+    if isinstance(sent_at, str):
+        return datetime.fromisoformat(sent_at).timestamp()
+    return float(sent_at)
+
+
 class ArticleStorage:
     """Manages storage of sent articles to prevent duplicates."""
 
     def __init__(self, storage_path: str):
         """
-        Initialize storage with path to JSON file.
+        Initialize storage with path to JSONL file.
 
         Args:
-            storage_path: Path to the JSON storage file
+            storage_path: Path to the JSONL storage file (one article per line)
         """
         self.storage_path = Path(storage_path)
+        # In-memory copy of the storage file, loaded lazily once per run
+        self._cache: Optional[Dict] = None
+        # Oldest 'sent_at' in the cache, lets cleanup skip the scan when nothing expired
+        self._oldest_sent_at: Optional[float] = None
         self.ensure_storage_exists()
 
     def ensure_storage_exists(self) -> None:
@@ -30,50 +52,146 @@ class ArticleStorage:
         # Create parent directory if needed
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize with empty dict if file doesn't exist
-        if not self.storage_path.exists():
-            self.save_sent_articles({})
-            logger.info(f"Created new storage file at {self.storage_path}")
+        if self.storage_path.exists():
+            return
+
+        # Migrate a legacy pretty-printed JSON dict stored next to the JSONL file
+        legacy_path = self.storage_path.with_suffix('.json')
+        if legacy_path.exists():
+            self._migrate_legacy(legacy_path)
+            return
+
+        # Initialize with an empty file
+        self.save_sent_articles({})
+        logger.info("Created new storage file at %s", self.storage_path)
+
+    def _migrate_legacy(self, legacy_path: Path) -> None:
+        """
+        Convert a legacy JSON dict store to JSONL and remove it.
+
+        Malformed entries are skipped one by one. If the legacy file can't be
+        read at all the error is raised rather than starting from an empty
+        store, which would re-send every previously sent article.
+
+        Args:
+            legacy_path: Path to the legacy JSON storage file
+        """
+        try:
+            legacy_data = orjson.loads(legacy_path.read_bytes())
+        except Exception as e:
+            logger.error("Error reading legacy storage %s: %s", legacy_path, e)
+            raise
+
+        sent_articles = {}
+        for key, entry in legacy_data.items():
+            try:
+                url = entry.get('url') or key
+                sent_articles[canonical_url(url)] = {
+                    'url': url,
+                    'sent_at': _to_timestamp(entry['sent_at']),
+                    'title': entry.get('title', '')
+                }
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                logger.error("Skipping malformed legacy entry %s: %s", key, e)
+
+        self.save_sent_articles(sent_articles)
+        legacy_path.unlink()
+        logger.info("Migrated %d entries from %s to %s", len(sent_articles), legacy_path, self.storage_path)
+
+    def _get(self) -> Dict:
+        """Return the cached sent articles, loading them on first access."""
+        if self._cache is None:
+            return self.load_sent_articles()
+        return self._cache
 
     def load_sent_articles(self) -> Dict:
         """
-        Load sent articles from JSON file.
+        Load sent articles from JSONL file and refresh the in-memory cache.
+        Later lines for the same URL replace earlier ones.
 
         Returns:
-            Dictionary mapping article URLs to metadata
+            Dictionary mapping canonical article URLs to metadata
             Format: {
-                'article_url': {
-                    'sent_at': 'ISO datetime',
-                    'title': 'article title',
-                    'url': 'article url'
+                'canonical_url': {
+                    'url': 'article url',
+                    'sent_at': Unix timestamp (float),
+                    'title': 'article title'
                 }
             }
         """
+        sent_articles = {}
+        oldest = None
+
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            logger.error(f"Error decoding JSON from {self.storage_path}, returning empty dict")
-            return {}
-        except Exception as e:
-            logger.error(f"Error loading sent articles: {e}")
-            return {}
+            with open(self.storage_path, 'rb') as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # A bad line is skipped on its own instead of aborting the whole load
+                    try:
+                        entry = orjson.loads(line)
+                        entry['sent_at'] = _to_timestamp(entry['sent_at'])
+                        key = canonical_url(entry['url'])
+                    except (orjson.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError) as e:
+                        logger.error("Skipping malformed line %s of %s: %s", line_number, self.storage_path, e)
+                        continue
+                    if oldest is None or entry['sent_at'] < oldest:
+                        oldest = entry['sent_at']
+                    sent_articles[key] = entry
+        except OSError as e:
+            logger.error("Error loading sent articles: %s", e)
+
+        self._cache = sent_articles
+        self._oldest_sent_at = oldest
+        return self._cache
 
     def save_sent_articles(self, data: Dict) -> None:
         """
-        Save sent articles to JSON file.
+        Rewrite the whole JSONL file (compaction).
+        Writes to a temporary file first and atomically replaces the original.
 
         Args:
             data: Dictionary of sent articles
         """
+        tmp_path = self.storage_path.with_name(self.storage_path.name + '.tmp')
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                for entry in data.values():
+                    f.write(orjson.dumps(entry) + b'\n')
+            os.replace(tmp_path, self.storage_path)
+            self._cache = data
+            self._oldest_sent_at = min(
+                (_to_timestamp(entry['sent_at']) for entry in data.values()),
+                default=None
+            )
+            logger.debug("Saved %d articles to storage", len(data))
+        except Exception as e:
+            logger.error("Error saving sent articles: %s", e)
+            raise
+
+    def _append_entries(self, entries: List[Dict]) -> None:
+        """
+        Append new entries to the JSONL file and the in-memory cache.
+
+        Args:
+            entries: List of entry dictionaries with 'url', 'sent_at' and 'title'
+        """
+        sent_articles = self._get()
+
         try:
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Saved {len(data)} articles to storage")
+            with open(self.storage_path, 'ab') as f:
+                for entry in entries:
+                    f.write(orjson.dumps(entry) + b'\n')
         except Exception as e:
-            logger.error(f"Error saving sent articles: {e}")
+            logger.error("Error saving sent articles: %s", e)
             raise
 
+        for entry in entries:
+            sent_articles[canonical_url(entry['url'])] = entry
+            if self._oldest_sent_at is None or entry['sent_at'] < self._oldest_sent_at:
+                self._oldest_sent_at = entry['sent_at']
+
     def is_sent(self, article_url: str) -> bool:
         """
         Check if an article URL has already been sent.
@@ -84,8 +202,23 @@ class ArticleStorage:
         Returns:
             True if article was already sent, False otherwise
         """
-        sent_articles = self.load_sent_articles()
-        return article_url in sent_articles
+        return canonical_url(article_url) in self._get()
+
+    def filter_unsent(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Filter out articles that have already been sent.
+
+        Args:
+            articles: List of article dictionaries with a 'url' key
+
+        Returns:
+            Articles whose URL has not been sent yet, in original order
+        """
+        sent_articles = self._get()
+        return [
+            article for article in articles
+            if canonical_url(article['url']) not in sent_articles
+        ]
 
     def mark_as_sent(self, article: Dict) -> None:
         """
@@ -94,47 +227,41 @@ class ArticleStorage:
         Args:
             article: Article dictionary with at least 'url' and 'title' keys
         """
-        sent_articles = self.load_sent_articles()
-
         article_url = article.get('url', '')
         if not article_url:
             logger.warning("Cannot mark article as sent: missing URL")
             return
 
-        sent_articles[article_url] = {
-            'sent_at': datetime.now().isoformat(),
-            'title': article.get('title', ''),
-            'url': article_url
-        }
-
-        self.save_sent_articles(sent_articles)
-        logger.debug(f"Marked article as sent: {article.get('title', 'Untitled')}")
+        self._append_entries([{
+            'url': article_url,
+            'sent_at': time.time(),
+            'title': article.get('title', '')
+        }])
+        logger.debug("Marked article as sent: %s", article.get('title', 'Untitled'))
 
     def mark_multiple_as_sent(self, articles: list) -> None:
         """
-        Mark multiple articles as sent in a single operation.
+        Mark multiple articles as sent in a single append.
 
         Args:
             articles: List of article dictionaries
         """
-        sent_articles = self.load_sent_articles()
-        current_time = datetime.now().isoformat()
+        current_time = time.time()
 
-        for article in articles:
-            article_url = article.get('url', '')
-            if article_url:
-                sent_articles[article_url] = {
-                    'sent_at': current_time,
-                    'title': article.get('title', ''),
-                    'url': article_url
-                }
-
-        self.save_sent_articles(sent_articles)
-        logger.info(f"Marked {len(articles)} articles as sent")
+        self._append_entries([
+            {
+                'url': article['url'],
+                'sent_at': current_time,
+                'title': article.get('title', '')
+            }
+            for article in articles
+            if article.get('url')
+        ])
+        logger.info("Marked %d articles as sent", len(articles))
 
     def cleanup_old_entries(self, days: int = 30) -> int:
         """
-        Remove entries older than specified days to keep file manageable.
+        Remove entries older than specified days and compact the file.
 
         Args:
             days: Number of days to keep (entries older than this will be removed)
@@ -142,22 +269,26 @@ class ArticleStorage:
         Returns:
             Number of entries removed
         """
-        sent_articles = self.load_sent_articles()
-        cutoff_date = datetime.now() - timedelta(days=days)
+        sent_articles = self._get()
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+
+        # Nothing to do if even the oldest entry is still within the window
+        if self._oldest_sent_at is None or self._oldest_sent_at > cutoff:
+            return 0
 
         # Filter out old entries
         original_count = len(sent_articles)
         sent_articles = {
             url: data
             for url, data in sent_articles.items()
-            if datetime.fromisoformat(data['sent_at']) > cutoff_date
+            if data['sent_at'] > cutoff
         }
 
         removed_count = original_count - len(sent_articles)
 
         if removed_count > 0:
             self.save_sent_articles(sent_articles)
-            logger.info(f"Cleaned up {removed_count} old entries (older than {days} days)")
+            logger.info("Cleaned up %s old entries (older than %s days)", removed_count, days)
 
         return removed_count
 
@@ -168,7 +299,7 @@ class ArticleStorage:
         Returns:
             Dictionary with stats (total count, oldest/newest dates)
         """
-        sent_articles = self.load_sent_articles()
+        sent_articles = self._get()
 
         if not sent_articles:
             return {
@@ -177,10 +308,190 @@ class ArticleStorage:
                 'newest': None
             }
 
-        dates = [datetime.fromisoformat(data['sent_at']) for data in sent_articles.values()]
+        timestamps = [data['sent_at'] for data in sent_articles.values()]
 
         return {
             'total': len(sent_articles),
-            'oldest': min(dates).isoformat(),
-            'newest': max(dates).isoformat()
+            'oldest': datetime.fromtimestamp(min(timestamps)).isoformat(),
+            'newest': datetime.fromtimestamp(max(timestamps)).isoformat()
+        }
+
+
+class BloomArticleStorage:
+    """
+    Tracks sent articles with Bloom filters instead of a JSON dict.
+
+    Membership checks may return rare false positives (an article is
+    treated as already sent), which is acceptable for a news digest.
+    Old entries are evicted by rotating two filter generations: once the
+    current generation is older than the cleanup window it becomes the
+    previous one and the old previous generation is dropped wholesale.
+    """
+
+    def __init__(self, storage_path: str, initial_capacity: int = 10_000, error_rate: float = 1e-6):
+        """
+        Initialize storage next to the given JSON storage path.
+
+        Args:
+            storage_path: Path to the JSON storage file (filter files are stored beside it)
+            initial_capacity: Initial capacity of each Bloom filter generation
+            error_rate: Target false positive rate
+        """
+        if ScalableBloomFilter is None:
+            raise ImportError("pybloom_live is required for BloomArticleStorage")
+
+        base_path = Path(storage_path).with_suffix('')
+        self.current_path = base_path.with_name(base_path.name + '.current.bloom')
+        self.previous_path = base_path.with_name(base_path.name + '.previous.bloom')
+        self.meta_path = base_path.with_name(base_path.name + '.bloom.json')
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+
+        self.current_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.current = self._load_filter(self.current_path)
+        self.previous = self._load_filter(self.previous_path)
+        self.meta = self._load_meta()
+
+    def _new_filter(self):
+        """Create an empty scalable Bloom filter."""
+        return ScalableBloomFilter(initial_capacity=self.initial_capacity, error_rate=self.error_rate)
+
+    def _load_filter(self, path: Path):
+        """Load a Bloom filter from disk, or create an empty one."""
+        if not path.exists():
+            return self._new_filter()
+
+        try:
+            with open(path, 'rb') as f:
+                return ScalableBloomFilter.fromfile(f)
+        except Exception as e:
+            logger.error("Error loading Bloom filter %s: %s", path, e)
+            return self._new_filter()
+
+    def _load_meta(self) -> Dict:
+        """Load generation metadata, initializing it if missing."""
+        try:
+            return orjson.loads(self.meta_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error loading Bloom storage metadata: %s", e)
+
+        return {
+            'generation_started': datetime.now().isoformat(),
+            'newest': None
+        }
+
+    @staticmethod
+    def _replace_file(path: Path, write) -> None:
+        """
+        Write a file via a temporary file and atomically replace the original,
+        so a crash mid-write never leaves a truncated filter behind.
+
+        Args:
+            path: Destination file path
+            write: Callable writing the contents to a binary file object
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def save(self) -> None:
+        """Persist both filter generations and metadata to disk."""
+        try:
+            self._replace_file(self.current_path, self.current.tofile)
+            self._replace_file(self.previous_path, self.previous.tofile)
+            meta = orjson.dumps(self.meta, option=orjson.OPT_INDENT_2)
+            self._replace_file(self.meta_path, lambda f: f.write(meta))
+            logger.debug("Saved Bloom storage (%d current entries)", len(self.current))
+        except Exception as e:
+            logger.error("Error saving Bloom storage: %s", e)
+            raise
+
+    def is_sent(self, article_url: str) -> bool:
+        """
+        Check if an article URL has (probably) already been sent.
+
+        Args:
+            article_url: URL of the article to check
+
+        Returns:
+            True if article was probably sent, False if it definitely was not
+        """
+        key = canonical_url(article_url)
+        return key in self.current or key in self.previous
+
+    def filter_unsent(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Filter out articles that have already been sent.
+
+        Args:
+            articles: List of article dictionaries with a 'url' key
+
+        Returns:
+            Articles whose URL has not been sent yet, in original order
+        """
+        return [article for article in articles if not self.is_sent(article['url'])]
+
+    def mark_as_sent(self, article: Dict) -> None:
+        """
+        Mark an article as sent.
+
+        Args:
+            article: Article dictionary with at least a 'url' key
+        """
+        self.mark_multiple_as_sent([article])
+
+    def mark_multiple_as_sent(self, articles: list) -> None:
+        """
+        Mark multiple articles as sent in a single operation.
+
+        Args:
+            articles: List of article dictionaries
+        """
+        for article in articles:
+            article_url = article.get('url', '')
+            if article_url:
+                self.current.add(canonical_url(article_url))
+
+        self.meta['newest'] = datetime.now().isoformat()
+        self.save()
+        logger.info("Marked %d articles as sent", len(articles))
+
+    def cleanup_old_entries(self, days: int = 30) -> int:
+        """
+        Rotate filter generations once the current one is older than the window.
+
+        Args:
+            days: Age in days after which the current generation is rotated
+
+        Returns:
+            Approximate number of entries dropped with the previous generation
+        """
+        generation_started = datetime.fromisoformat(self.meta['generation_started'])
+        if generation_started > datetime.now() - timedelta(days=days):
+            return 0
+
+        removed_count = len(self.previous)
+        self.previous = self.current
+        self.current = self._new_filter()
+        self.meta['generation_started'] = datetime.now().isoformat()
+        self.save()
+
+        logger.info("Rotated Bloom storage generations, dropped ~%s old entries", removed_count)
+        return removed_count
+
+    def get_stats(self) -> Dict:
+        """
+        Get statistics about stored articles.
+
+        Returns:
+            Dictionary with stats (approximate total count, generation start, newest date)
+        """
+        return {
+            'total': len(self.current) + len(self.previous),
+            'oldest': self.meta['generation_started'],
+            'newest': self.meta['newest']
         }
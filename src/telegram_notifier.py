@@ -5,20 +5,104 @@ Sends digest messages to Telegram with formatted article lists.
 
 import logging
 import asyncio
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import List, Dict
-import pytz
-
-from telegram import Bot
-from telegram.error import TelegramError
+from typing import List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    RetryError,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from telegram import MessageEntity
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TelegramError, TimedOut
+from telegram.ext import AIORateLimiter, ExtBot
+from telegram.request import HTTPXRequest
+
+from src.url_utils import canonical_url
 
 logger = logging.getLogger(__name__)
 
 
+# Event loop shared by every notifier in the process, running on one daemon thread.
+# Created on first use so importing the module doesn't start a thread.
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def _get_shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide notifier event loop, starting its thread if needed."""
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_shared_loop.run_forever,
+                name="telegram-notifier",
+                daemon=True
+            ).start()
+        return _shared_loop
+
+
+class _DeadlineHTTPXRequest(HTTPXRequest):
+    """
+    HTTPXRequest that puts a hard deadline on each HTTP round trip.
+
+    The deadline covers only the HTTP call, not the rate limiter's waits around
+    it, so honouring a long retry_after is never cut short.
+    """
+
+    def __init__(self, hard_deadline: float, **kwargs):
+        super().__init__(**kwargs)
+        self.hard_deadline = hard_deadline
+
+    async def do_request(self, *args, **kwargs):
+        try:
+            return await asyncio.wait_for(super().do_request(*args, **kwargs), timeout=self.hard_deadline)
+        except asyncio.TimeoutError as e:
+            # Surface a hung request like any other timeout so it is retried with backoff
+            raise TimedOut(f"Request exceeded the {self.hard_deadline}s hard deadline") from e
+
+
+def _utf16_len(text: str) -> int:
+    """Length of text in UTF-16 code units, the unit Telegram entity offsets use."""
+    return len(text.encode('utf-16-le')) // 2
+
+
 class TelegramNotifier:
     """Sends notifications via Telegram bot."""
 
-    def __init__(self, bot_token: str, chat_id: str, timezone: str = "America/Lima"):
+    # Digest header time format, e.g. "08:00 AM"
+    _TIME_FMT = "%I:%M %p"
+
+    # Number of recently sent digest hashes remembered to skip duplicate sends
+    _RECENT_MESSAGES_MAX = 16
+
+    # Extra seconds sync callers allow for rate limiter waits (429 retry_after, 20/min)
+    _RATE_LIMIT_MARGIN = 60.0
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        timezone: str = "America/Lima",
+        batch_window: float = 0.5,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 20.0,
+        pool_size: int = 8,
+        pool_timeout: float = 5.0,
+        retry_count: int = 3,
+        max_backoff: float = 60.0
+    ):
         """
         Initialize Telegram notifier.
 
@@ -26,77 +110,165 @@ class TelegramNotifier:
             bot_token: Telegram bot token from BotFather
             chat_id: Chat ID to send messages to
             timezone: Timezone for timestamps in messages
+            batch_window: Seconds to wait for more digests to merge into one message
+            connect_timeout: Seconds allowed to connect to the Telegram API
+            read_timeout: Seconds allowed to wait for a Telegram response
+            pool_size: Number of pooled HTTP connections to the Telegram API
+            pool_timeout: Seconds to wait for a free pooled connection
+            retry_count: Number of send attempts on transient network errors
+            max_backoff: Upper bound in seconds for the wait between retries
         """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_timeout = pool_timeout
+        self.retry_count = retry_count
+        self.max_backoff = max_backoff
+        # Hard ceiling on a single HTTP request in case it hangs without timing out
+        self.hard_deadline = read_timeout + 5.0
+
         if not bot_token or not chat_id:
             logger.warning("Telegram credentials not provided, notifications will be skipped")
             self.bot = None
             self.chat_id = None
+            self._request = None
+            self._rate_limiter = None
         else:
-            self.bot = Bot(token=bot_token)
+            # Explicit request object so its connection pool is reused across sends,
+            # sized and with timeouts fixed up front instead of library defaults.
+            # It also serves getUpdates (never polled) so the bot holds a single pool.
+            self._request = _DeadlineHTTPXRequest(
+                hard_deadline=self.hard_deadline,
+                connection_pool_size=pool_size,
+                pool_timeout=pool_timeout,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                write_timeout=read_timeout
+            )
+            # Rate limiter spaces out requests (1/s overall, 20/min per group) and
+            # retries Telegram's 429 responses itself, honouring retry_after
+            self._rate_limiter = AIORateLimiter(overall_max_rate=1, overall_time_period=1, max_retries=3)
+            self.bot = ExtBot(
+                token=bot_token,
+                request=self._request,
+                get_updates_request=self._request,
+                rate_limiter=self._rate_limiter
+            )
             self.chat_id = chat_id
 
-        self.timezone = pytz.timezone(timezone)
-
-    def format_digest_message(self, articles: List[Dict], max_articles: int = 5) -> str:
+        self.timezone = ZoneInfo(timezone)
+
+        # Header time string only changes once a minute, keep the last rendering
+        self._last_time_key: Optional[Tuple[int, int]] = None
+        self._last_time_str = ""
+
+        # Long-lived event loop keeps the bot's HTTP connections warm between sends.
+        # It is shared by all notifiers and runs on a daemon thread so callers are
+        # not blocked by Telegram latency.
+        self._loop = _get_shared_loop()
+        self._closed = False
+
+        # Digests queued within batch_window of each other are sent as one message
+        self.batch_window = batch_window
+        self._pending: asyncio.Queue = asyncio.Queue()
+
+        # Hashes of recently sent digests (oldest first)
+        self._recent_messages: OrderedDict = OrderedDict()
+        self._batcher_task: asyncio.Task = asyncio.run_coroutine_threadsafe(
+            self._start_batcher(), self._loop
+        ).result()
+
+    def format_digest_message(
+        self,
+        articles: List[Dict],
+        max_articles: int = 5
+    ) -> Tuple[str, List[MessageEntity]]:
         """
         Format articles as a digest message.
 
+        Formatting is expressed as message entities instead of HTML markup, so
+        titles are sent verbatim without escaping.
+
         Args:
             articles: List of article dictionaries (should be sorted by date, newest first)
-            max_articles: Maximum number of articles to include
+            max_articles: Maximum number of unique articles to include
 
         Returns:
-            Formatted message string
+            Tuple of (plain message text, formatting entities)
         """
-        # Get current time in specified timezone
+        # Get current time in specified timezone, re-rendered only when the minute changes
         now = datetime.now(self.timezone)
-        time_str = now.strftime("%I:%M %p")  # e.g., "08:00 AM"
-
-        # Build message header
-        message_parts = [
-            f"🗞️ <b>AI News Digest - {time_str}</b>\n"
-        ]
-
-        # Add articles (limit to max_articles)
-        articles_to_show = articles[:max_articles]
+        time_key = (now.hour, now.minute)
+        if time_key != self._last_time_key:
+            self._last_time_key = time_key
+            self._last_time_str = now.strftime(self._TIME_FMT)
+        time_str = self._last_time_str
+
+        articles_to_show = self._select_articles(articles, max_articles)
+
+        # Bold header followed by one blank-line separated entry per article,
+        # each title linking to its article. Entity offsets are tracked as we write.
+        buffer = io.StringIO()
+        header = f"🗞️ AI News Digest - {time_str}"
+        buffer.write(header + "\n")
+        entities = [MessageEntity(MessageEntity.BOLD, 0, _utf16_len(header))]
+        offset = _utf16_len(header) + 1
 
         for idx, article in enumerate(articles_to_show, 1):
-            title = article.get('title', 'Untitled')
-            url = article.get('url', '')
-
-            # Escape HTML special characters in title
-            title = self._escape_html(title)
-
-            message_parts.append(f"{idx}. {title}")
-            message_parts.append(f"   → {url}\n")
-
-        # Join all parts
-        message = "\n".join(message_parts)
-
-        return message
-
-    def _escape_html(self, text: str) -> str:
+            # NewsAPI may send null titles; fall back instead of rendering "None"
+            title = article.get('title') or 'Untitled'
+            url = article.get('url') or ''
+            prefix = f"\n{idx}. "
+            entry = f"{prefix}{title}\n   → {url}\n"
+            buffer.write(entry)
+
+            if url and title:
+                entities.append(MessageEntity(
+                    MessageEntity.TEXT_LINK,
+                    offset + _utf16_len(prefix),
+                    _utf16_len(title),
+                    url=url
+                ))
+            offset += _utf16_len(entry)
+
+        return buffer.getvalue(), entities
+
+    @staticmethod
+    def _select_articles(articles: List[Dict], max_articles: int) -> List[Dict]:
         """
-        Escape HTML special characters for Telegram HTML formatting.
+        Fill the max_articles digest slots with unique URLs, stopping once they are full.
 
         Args:
-            text: Text to escape
+            articles: List of article dictionaries in display order
+            max_articles: Maximum number of unique articles to keep
 
         Returns:
-            Escaped text
+            Articles to show, deduplicated by canonical URL
         """
-        return (text
-                .replace('&', '&amp;')
-                .replace('<', '&lt;')
-                .replace('>', '&gt;'))
-
-    async def _send_message_async(self, message: str, retry_count: int = 3) -> bool:
+        seen_urls = set()
+        articles_to_show = []
+        for article in articles:
+            url = canonical_url(article.get('url', ''))
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            articles_to_show.append(article)
+            if len(articles_to_show) >= max_articles:
+                break
+        return articles_to_show
+
+    async def _send_message_async(
+        self,
+        message: str,
+        entities: Optional[List[MessageEntity]] = None,
+        retry_count: Optional[int] = None
+    ) -> bool:
         """
         Send message asynchronously with retry logic.
 
         Args:
-            message: Message text to send
-            retry_count: Number of retries on failure
+            message: Plain message text to send
+            entities: Formatting entities applied to the message text
+            retry_count: Number of attempts, defaults to the notifier's retry_count
 
         Returns:
             True if sent successfully, False otherwise
@@ -105,38 +277,82 @@ class TelegramNotifier:
             logger.warning("Telegram bot not configured, skipping message send")
             return False
 
-        for attempt in range(retry_count):
-            try:
-                await self.bot.send_message(
-                    chat_id=self.chat_id,
-                    text=message,
-                    parse_mode='HTML',
-                    disable_web_page_preview=True
-                )
-                logger.info("Successfully sent Telegram notification")
-                return True
-
-            except TelegramError as e:
-                logger.warning(f"Telegram error on attempt {attempt + 1}/{retry_count}: {e}")
-
-                if attempt < retry_count - 1:
-                    # Exponential backoff
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Failed to send Telegram notification after {retry_count} attempts")
-                    return False
+        if retry_count is None:
+            retry_count = self.retry_count
 
-            except Exception as e:
-                logger.error(f"Unexpected error sending Telegram message: {e}")
-                return False
+        # Only transient network failures (including requests cut off by the hard
+        # deadline) are retried. BadRequest subclasses NetworkError but retrying an
+        # invalid request can't help.
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type((TimedOut, NetworkError)) & retry_if_not_exception_type(BadRequest),
+            wait=wait_exponential_jitter(initial=1, max=self.max_backoff),
+            stop=stop_after_attempt(retry_count),
+            before_sleep=self._log_retry,
+            reraise=False
+        )
 
-        return False
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    await self.bot.send_message(
+                        chat_id=self.chat_id,
+                        text=message,
+                        entities=entities,
+                        disable_web_page_preview=True,
+                        connect_timeout=self.connect_timeout,
+                        read_timeout=self.read_timeout,
+                        pool_timeout=self.pool_timeout
+                    )
+
+        except RetryError:
+            logger.error("Failed to send Telegram notification after %s attempts", retry_count)
+            return False
 
-    def send_digest(self, articles: List[Dict], max_articles: int = 5) -> bool:
+        except RetryAfter as e:
+            # The rate limiter already waited and retried on 429, give up
+            logger.error("Telegram rate limit still exceeded after retries: %s", e)
+            return False
+
+        except (BadRequest, Forbidden) as e:
+            # The request itself is invalid or the bot was blocked, retrying won't help
+            logger.error("Telegram rejected the message, not retrying: %s", e)
+            return False
+
+        except TelegramError as e:
+            logger.error("Telegram error, not retrying: %s", e)
+            return False
+
+        except Exception as e:
+            logger.error("Unexpected error sending Telegram message: %s", e)
+            return False
+
+        logger.info("Successfully sent Telegram notification")
+        return True
+
+    @staticmethod
+    def _log_retry(retry_state: RetryCallState) -> None:
+        """Log a failed send attempt before tenacity sleeps and retries."""
+        logger.warning(
+            "Telegram send attempt %s failed: %r. Retrying in %.1f seconds...",
+            retry_state.attempt_number,
+            retry_state.outcome.exception(),
+            retry_state.next_action.sleep
+        )
+
+    async def _run_on_loop(self, coro):
         """
-        Send digest notification with top articles.
+        Await a coroutine on the notifier's loop from any event loop.
+
+        The bot's HTTP connections belong to the notifier's loop, so callers
+        on other loops are bridged to it without blocking their own loop.
+        """
+        if asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def send_digest_async(self, articles: List[Dict], max_articles: int = 5) -> bool:
+        """
+        Send digest notification with top articles (preferred from async code).
 
         Args:
             articles: List of article dictionaries (will be limited to max_articles)
@@ -149,20 +365,92 @@ class TelegramNotifier:
             logger.info("No articles to send, skipping notification")
             return False
 
-        # Format the digest message
-        message = self.format_digest_message(articles, max_articles)
+        if self._closed:
+            logger.warning("Telegram notifier is closed, skipping digest")
+            return False
 
-        # Send the message
         try:
-            # Run async function in event loop
-            return asyncio.run(self._send_message_async(message))
+            return await self._run_on_loop(self._enqueue_digest(articles, max_articles))
         except Exception as e:
-            logger.error(f"Error in send_digest: {e}")
+            logger.error("Error in send_digest: %s", e)
             return False
 
-    def send_error_notification(self, error_message: str) -> bool:
+    async def _enqueue_digest(self, articles: List[Dict], max_articles: int) -> bool:
+        """Queue a digest for the batcher and wait for the send result."""
+        result = self._loop.create_future()
+        await self._pending.put((articles, max_articles, result))
+        return await result
+
+    async def _start_batcher(self) -> asyncio.Task:
+        """Start the batcher as a task on the notifier loop."""
+        return asyncio.create_task(self._batcher())
+
+    async def _batcher(self) -> None:
         """
-        Send error notification (optional, for critical failures).
+        Merge digests queued within batch_window into a single Telegram message.
+        Every merged caller receives the result of the shared send. A None item
+        queued by close() stops the batcher once the current batch is sent.
+        """
+        while True:
+            item = await self._pending.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            sent = False
+
+            # Any failure (or cancellation) while preparing or sending fails this
+            # batch only; every caller is resolved and the batcher keeps running
+            try:
+                await asyncio.sleep(self.batch_window)
+                while not self._pending.empty():
+                    item = self._pending.get_nowait()
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+
+                # Keep each caller's own top unique articles so nothing they expect is cut
+                merged_articles = []
+                for articles, max_articles, _ in batch:
+                    merged_articles.extend(self._select_articles(articles, max_articles))
+
+                articles_to_show = self._select_articles(merged_articles, len(merged_articles))
+                message, entities = self.format_digest_message(articles_to_show, len(articles_to_show))
+
+                # Identical digest already delivered (e.g. overlapping scheduled runs).
+                # Keyed on the articles rather than the text, whose header carries the time.
+                digest_key = '\n'.join(canonical_url(article.get('url', '')) for article in articles_to_show)
+                message_hash = hashlib.blake2b(digest_key.encode('utf-8'), digest_size=8).digest()
+                if message_hash in self._recent_messages:
+                    logger.info("Identical digest was sent recently, skipping duplicate send")
+                    sent = True
+                else:
+                    sent = await self._send_message_async(message, entities)
+
+                    if sent:
+                        self._recent_messages[message_hash] = None
+                        if len(self._recent_messages) > self._RECENT_MESSAGES_MAX:
+                            self._recent_messages.popitem(last=False)
+
+                if len(batch) > 1:
+                    logger.info("Coalesced %d digests into one Telegram message", len(batch))
+
+            except Exception as e:
+                logger.error("Error in send_digest: %s", e)
+                sent = False
+
+            finally:
+                for _, _, result in batch:
+                    if not result.done():
+                        result.set_result(sent)
+
+            if stop:
+                return
+
+    async def send_error_notification_async(self, error_message: str) -> bool:
+        """
+        Send error notification (preferred from async code).
 
         Args:
             error_message: Error message to send
@@ -170,13 +458,121 @@ class TelegramNotifier:
         Returns:
             True if sent successfully, False otherwise
         """
-        if not self.bot or not self.chat_id:
+        if not self.bot or not self.chat_id or self._closed:
             return False
 
-        message = f"⚠️ <b>AI News Alerts Error</b>\n\n{self._escape_html(error_message)}"
+        header = "⚠️ AI News Alerts Error"
+        message = f"{header}\n\n{error_message}"
+        entities = [MessageEntity(MessageEntity.BOLD, 0, _utf16_len(header))]
 
         try:
-            return asyncio.run(self._send_message_async(message, retry_count=1))
+            return await self._run_on_loop(self._send_message_async(message, entities, retry_count=1))
         except Exception as e:
-            logger.error(f"Error sending error notification: {e}")
+            logger.error("Error sending error notification: %s", e)
+            return False
+
+    def _send_timeout(self, retry_count: int) -> float:
+        """Upper bound in seconds for a send making retry_count attempts, batching included."""
+        return (
+            self.batch_window
+            + retry_count * (self.hard_deadline + self.max_backoff)
+            + self._RATE_LIMIT_MARGIN
+        )
+
+    def _wait_result(self, future: Future, retry_count: int) -> bool:
+        """
+        Block on a send future for at most as long as retry_count attempts can take.
+
+        Args:
+            future: Future returned by scheduling a send on the notifier loop
+            retry_count: Number of send attempts the future may make
+
+        Returns:
+            The send result, or False if it didn't finish in time
+        """
+        timeout = self._send_timeout(retry_count)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.error("Telegram send did not finish within %.0f seconds, giving up", timeout)
+            future.cancel()
             return False
+
+    def send_digest_nowait(self, articles: List[Dict], max_articles: int = 5) -> Future:
+        """
+        Schedule a digest notification without waiting for Telegram.
+
+        Args:
+            articles: List of article dictionaries (will be limited to max_articles)
+            max_articles: Maximum number of articles to include
+
+        Returns:
+            Future resolving to True if sent successfully, False otherwise
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.send_digest_async(articles, max_articles), self._loop
+        )
+
+    def send_digest(self, articles: List[Dict], max_articles: int = 5) -> bool:
+        """
+        Send digest notification with top articles.
+        Synchronous shim over send_digest_async; async callers should await that instead.
+
+        Args:
+            articles: List of article dictionaries (will be limited to max_articles)
+            max_articles: Maximum number of articles to include
+
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        return self._wait_result(self.send_digest_nowait(articles, max_articles), self.retry_count)
+
+    def send_error_notification(self, error_message: str) -> bool:
+        """
+        Send error notification (optional, for critical failures).
+        Synchronous shim over send_error_notification_async.
+
+        Args:
+            error_message: Error message to send
+
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.send_error_notification_async(error_message), self._loop
+        )
+        return self._wait_result(future, 1)
+
+    async def _shutdown_async(self) -> None:
+        """Let the batcher finish its current batch, fail digests still queued and shut down the bot."""
+        await self._pending.put(None)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._batcher_task), timeout=self._send_timeout(self.retry_count))
+        except asyncio.TimeoutError:
+            logger.warning("Digest batcher did not finish in time, cancelling it")
+            self._batcher_task.cancel()
+            await asyncio.gather(self._batcher_task, return_exceptions=True)
+
+        while not self._pending.empty():
+            item = self._pending.get_nowait()
+            if item is not None and not item[2].done():
+                item[2].set_result(False)
+
+        # The bot is never initialize()d (that would cost a getMe call), so
+        # Bot.shutdown() is a no-op: close the HTTP pool and limiter directly
+        if self._request:
+            await self._request.shutdown()
+        if self._rate_limiter:
+            await self._rate_limiter.shutdown()
+
+    def close(self) -> None:
+        """Shut down the bot's HTTP connections. The shared loop keeps running for other notifiers."""
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown_async(), self._loop).result()
+        except Exception as e:
+            logger.warning("Error shutting down Telegram bot: %s", e)
+
@@ -0,0 +1,38 @@
+"""
+URL helpers shared by fetching and storage.
+Canonicalizes article URLs so the same story is recognized across sources.
+"""
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'ref', 'ref_src'})
+
+
+def canonical_url(url: str) -> str:
+    """
+    Build a canonical form of an article URL for deduplication.
+
+    Lowercases scheme and host, treats http as https, drops the fragment and
+    tracking query parameters (utm_*, fbclid, ref, ...) and strips any
+    trailing slash from the path.
+
+    Args:
+        url: Article URL as published by the source
+
+    Returns:
+        Canonical URL string (only meant as a lookup key, not for display)
+    """
+    parts = urlsplit(url.strip())
+
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ])
+
+    return urlunsplit((scheme, parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
@@ -0,0 +1,90 @@
+"""Tests for keyword matching."""
+
+import pytest
+
+from src import keyword_matcher
+from src.keyword_matcher import KeywordMatcher
+
+KEYWORDS = ['agent', 'Agent SDK', 'AI', 'agentic AI', 'GPT-4']
+
+
+@pytest.fixture(params=['automaton', 'regex'])
+def matcher(request, monkeypatch):
+    if request.param == 'automaton':
+        if keyword_matcher.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    return KeywordMatcher(KEYWORDS)
+
+
+def _article(title, description=''):
+    return {'title': title, 'description': description}
+
+
+def test_nested_keywords_are_all_reported(matcher):
+    assert matcher.find_matches(_article('The new agent SDK is out')) == {'agent', 'Agent SDK'}
+    assert matcher.find_matches(_article('Agentic AI is everywhere')) == {'agentic AI', 'AI'}
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('agent', {'agent'}),
+    ('AI wins', {'AI'}),
+    ('Built with AI', {'AI'}),
+    ('Hello AI.', {'AI'}),
+    ('my_agent ships', set()),
+    ('agent_v2 ships', set()),
+    ('Agents and agentic workflows', set()),
+    ('MAIL is not AI-related', {'AI'}),
+    ('GPT-4 launches', {'GPT-4'}),
+    ('GPT-4o launches', set()),
+    ('(GPT-4)', {'GPT-4'}),
+    ('The agentic AI agent SDK', {'agentic AI', 'AI', 'agent', 'Agent SDK'}),
+])
+def test_word_boundaries(matcher, title, expected):
+    assert matcher.find_matches(_article(title)) == expected
+    assert (matcher.search_any(_article(title)) is not None) == bool(expected)
+
+
+def test_keyword_only_in_description(matcher):
+    assert matcher.find_matches(_article('Weekly roundup', 'A new agent framework')) == {'agent'}
+
+
+def test_missing_description_and_title(matcher):
+    assert matcher.find_matches({'title': 'AI news', 'description': None}) == {'AI'}
+    assert matcher.find_matches({'title': None, 'description': None}) == set()
+    assert matcher.search_any({'title': None, 'description': None}) is None
+
+
+def test_title_and_description_do_not_join_into_a_keyword(matcher):
+    # The parts are joined with a space, so no keyword spans the seam
+    assert matcher.find_matches(_article('Agent', 'SDK update')) == {'agent', 'Agent SDK'}
+    assert matcher.find_matches(_article('GPT', '-4 rumours')) == set()
+
+
+def test_symbol_edged_keyword_matches_like_regex(monkeypatch):
+    keywords = ['C++', '.NET']
+    texts = ['Learning C++ today', 'C++17 features', 'ASP.NET core', 'the .NET runtime', 'xC++']
+
+    monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    regex_results = [KeywordMatcher(keywords).find_matches(_article(t)) for t in texts]
+    monkeypatch.undo()
+
+    if keyword_matcher.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    automaton_results = [KeywordMatcher(keywords).find_matches(_article(t)) for t in texts]
+
+    assert automaton_results == regex_results
+
+
+def test_filter_and_stats(matcher):
+    articles = [_article('AI agent news'), _article('Sports'), _article('More AI')]
+
+    filtered = matcher.filter_articles(articles)
+    matcher.add_matched_keywords(filtered)
+
+    assert filtered == [articles[0], articles[2]]
+    stats = matcher.get_keyword_stats(filtered)
+    assert stats['AI'] == 2
+    assert stats['agent'] == 1
+    assert stats['GPT-4'] == 0
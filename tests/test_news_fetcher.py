@@ -0,0 +1,92 @@
+"""Tests for news fetching."""
+
+from unittest import mock
+
+from src.news_fetcher import NewsAPIFetcher, RSSFetcher
+
+
+def _newsapi_response(articles):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'status': 'ok', 'totalResults': len(articles), 'articles': articles}
+    return response
+
+
+def test_newsapi_fetch_sends_request_with_valid_from_param():
+    fetcher = NewsAPIFetcher(api_key='test-key')
+    article = {
+        'url': 'https://example.com/story',
+        'title': 'OpenAI ships a model',
+        'description': 'Details',
+        'publishedAt': '2024-01-15T10:30:00Z',
+        'source': {'name': 'Example'},
+    }
+
+    with mock.patch('requests.get', return_value=_newsapi_response([article])) as get:
+        articles = fetcher.fetch_articles(['OpenAI'], hours_ago=8)
+
+    get.assert_called_once()
+    params = get.call_args.kwargs['params']
+    assert len(params['from']) == len('YYYY-MM-DDTHH:MM:SS')
+    assert params['q'] == '"OpenAI"'
+    assert [a['url'] for a in articles] == ['https://example.com/story']
+
+
+def test_newsapi_title_only_uses_qintitle():
+    fetcher = NewsAPIFetcher(api_key='test-key', domains=['a.com', 'b.com'], title_only=True)
+
+    with mock.patch('requests.get', return_value=_newsapi_response([])) as get:
+        fetcher.fetch_articles(['GPT'])
+
+    params = get.call_args.kwargs['params']
+    assert params['qintitle'] == '"GPT"'
+    assert params['domains'] == 'a.com,b.com'
+    assert 'q' not in params
+
+
+def _feed_response(status_code, headers=None, content=b'', url='https://example.com/feed.xml'):
+    response = mock.Mock(status_code=status_code, headers=headers or {}, content=content, url=url)
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_rss_validators_persist_across_runs(tmp_path):
+    path = tmp_path / 'validators.json'
+    feed_url = 'https://example.com/feed.xml'
+    rss = b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title></channel></rss>'
+
+    fetcher = RSSFetcher(validators_path=str(path))
+    first = _feed_response(200, {'ETag': '"abc"', 'Last-Modified': 'Mon, 15 Jan 2024 10:00:00 GMT'}, rss)
+    with mock.patch.object(fetcher.session, 'get', return_value=first):
+        fetcher.fetch_feed(feed_url, 'Example')
+    fetcher.save_validators()
+
+    # A new fetcher, as in the next scheduled run, sends the saved validators
+    next_run = RSSFetcher(validators_path=str(path))
+    with mock.patch.object(next_run.session, 'get', return_value=_feed_response(304)) as get:
+        assert next_run.fetch_feed(feed_url, 'Example') == []
+
+    headers = get.call_args.kwargs['headers']
+    assert headers['If-None-Match'] == '"abc"'
+    assert headers['If-Modified-Since'] == 'Mon, 15 Jan 2024 10:00:00 GMT'
+
+
+def test_rss_relative_links_resolve_against_feed_url():
+    rss = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+        '<item><title>Café AI</title><link>/news/story</link>'
+        '<pubDate>Mon, 15 Jan 2024 10:00:00 GMT</pubDate></item>'
+        '</channel></rss>'
+    ).encode('latin-1')
+    response = _feed_response(
+        200,
+        {'Content-Type': 'application/rss+xml; charset=iso-8859-1'},
+        rss,
+        url='https://example.com/feeds/main.xml'
+    )
+
+    fetcher = RSSFetcher()
+    with mock.patch.object(fetcher.session, 'get', return_value=response):
+        articles = fetcher.fetch_feed('https://example.com/feeds/main.xml', 'Example', hours_ago=24 * 365 * 100)
+
+    assert [a['url'] for a in articles] == ['https://example.com/news/story']
+    assert articles[0]['title'] == 'Café AI'
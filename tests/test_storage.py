@@ -0,0 +1,201 @@
+"""Tests for sent article storage."""
+
+import json
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import orjson
+import pytest
+
+from src.storage import ArticleStorage
+
+
+def _write_lines(path, entries):
+    path.write_bytes(b''.join(orjson.dumps(entry) + b'\n' for entry in entries))
+
+
+def test_load_jsonl_keys_by_canonical_url(tmp_path):
+    path = tmp_path / 'sent.jsonl'
+    _write_lines(path, [
+        {'url': 'http://Example.com/a/?utm_source=x', 'sent_at': 1700000000.0, 'title': 'A'},
+        {'url': 'https://example.com/b', 'sent_at': 1700000100.0, 'title': 'B'},
+    ])
+
+    storage = ArticleStorage(str(path))
+
+    assert storage.is_sent('https://example.com/a')
+    assert storage.is_sent('https://example.com/b#comments')
+    assert not storage.is_sent('https://example.com/c')
+    assert storage.get_stats()['total'] == 2
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    path = tmp_path / 'sent.jsonl'
+    _write_lines(path, [
+        {'url': 'https://example.com/a', 'sent_at': 1700000000.0, 'title': 'A'},
+        {'title': 'no url'},
+        {'url': 'https://example.com/bad-date', 'sent_at': 'not a date', 'title': 'C'},
+        {'url': 'https://example.com/no-date', 'sent_at': None, 'title': 'D'},
+    ])
+    with open(path, 'ab') as f:
+        f.write(b'{not json\n')
+        f.write(b'42\n')
+        f.write(orjson.dumps({'url': 'https://example.com/b', 'sent_at': 1700000100.0, 'title': 'B'}) + b'\n')
+
+    storage = ArticleStorage(str(path))
+
+    assert storage.get_stats()['total'] == 2
+    assert storage.is_sent('https://example.com/a')
+    assert storage.is_sent('https://example.com/b')
+
+
+def test_legacy_json_is_migrated(tmp_path):
+    legacy_path = tmp_path / 'sent.json'
+    legacy_path.write_text(json.dumps({
+        'http://example.com/a/': {
+            'url': 'http://example.com/a/',
+            'sent_at': '2024-01-15T10:30:00',
+            'title': 'A',
+        }
+    }, indent=2))
+
+    storage = ArticleStorage(str(tmp_path / 'sent.jsonl'))
+
+    assert not legacy_path.exists()
+    assert (tmp_path / 'sent.jsonl').exists()
+    assert storage.is_sent('https://example.com/a')
+    assert isinstance(storage.load_sent_articles()['https://example.com/a']['sent_at'], float)
+
+
+def test_legacy_migration_skips_malformed_entries(tmp_path):
+    legacy_path = tmp_path / 'sent.json'
+    legacy_path.write_text(json.dumps({
+        'https://example.com/a': {'url': 'https://example.com/a', 'sent_at': '2024-01-15T10:30:00', 'title': 'A'},
+        'https://example.com/bad': {'url': 'https://example.com/bad', 'sent_at': 'yesterday', 'title': 'Bad'},
+        'https://example.com/missing': {'url': 'https://example.com/missing', 'title': 'Missing'},
+        'https://example.com/b': {'sent_at': '2024-01-16T10:30:00', 'title': 'B'},
+    }))
+
+    storage = ArticleStorage(str(tmp_path / 'sent.jsonl'))
+
+    assert not legacy_path.exists()
+    assert storage.get_stats()['total'] == 2
+    assert storage.is_sent('https://example.com/a')
+    assert storage.is_sent('https://example.com/b')
+
+    # The migrated file holds the good entries for the next run too
+    assert ArticleStorage(str(tmp_path / 'sent.jsonl')).get_stats()['total'] == 2
+
+
+def test_unreadable_legacy_store_is_not_replaced_by_empty_one(tmp_path):
+    legacy_path = tmp_path / 'sent.json'
+    legacy_path.write_text('{truncated')
+
+    with pytest.raises(orjson.JSONDecodeError):
+        ArticleStorage(str(tmp_path / 'sent.jsonl'))
+
+    assert legacy_path.exists()
+    assert not (tmp_path / 'sent.jsonl').exists()
+
+
+def test_appended_entries_survive_reload(tmp_path):
+    path = tmp_path / 'sent.jsonl'
+    storage = ArticleStorage(str(path))
+
+    storage.mark_multiple_as_sent([
+        {'url': 'https://example.com/a', 'title': 'A'},
+        {'url': 'https://example.com/b', 'title': 'B'},
+    ])
+    storage.mark_as_sent({'url': 'https://example.com/c', 'title': 'C'})
+
+    reloaded = ArticleStorage(str(path))
+    assert reloaded.filter_unsent([
+        {'url': 'https://example.com/a'},
+        {'url': 'https://example.com/d'},
+    ]) == [{'url': 'https://example.com/d'}]
+    assert reloaded.get_stats()['total'] == 3
+
+
+def test_cleanup_compacts_file(tmp_path):
+    path = tmp_path / 'sent.jsonl'
+    now = time.time()
+    _write_lines(path, [
+        {'url': 'https://example.com/old', 'sent_at': now - 40 * 86400, 'title': 'Old'},
+        {'url': 'https://example.com/new', 'sent_at': now - 86400, 'title': 'New'},
+        {'url': 'https://example.com/new', 'sent_at': now, 'title': 'New again'},
+    ])
+
+    storage = ArticleStorage(str(path))
+
+    assert storage.cleanup_old_entries(days=30) == 1
+    lines = path.read_bytes().splitlines()
+    assert [orjson.loads(line)['url'] for line in lines] == ['https://example.com/new']
+    assert not storage.is_sent('https://example.com/old')
+    assert not (tmp_path / 'sent.jsonl.tmp').exists()
+
+    # Nothing older than the window is left, so a second cleanup is a no-op
+    assert storage.cleanup_old_entries(days=30) == 0
+
+
+@pytest.fixture
+def bloom_storage_cls():
+    pytest.importorskip('pybloom_live')
+    from src.storage import BloomArticleStorage
+    return BloomArticleStorage
+
+
+def test_bloom_storage_round_trip(tmp_path, bloom_storage_cls):
+    path = str(tmp_path / 'sent.jsonl')
+    storage = bloom_storage_cls(path, initial_capacity=100)
+    storage.mark_multiple_as_sent([
+        {'url': 'http://example.com/a/?utm_source=x', 'title': 'A'},
+        {'url': 'https://example.com/b', 'title': 'B'},
+    ])
+
+    reloaded = bloom_storage_cls(path, initial_capacity=100)
+
+    assert reloaded.is_sent('https://example.com/a')
+    assert reloaded.is_sent('https://example.com/b')
+    assert reloaded.filter_unsent([{'url': 'https://example.com/c'}]) == [{'url': 'https://example.com/c'}]
+    assert reloaded.get_stats()['total'] == 2
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_bloom_storage_rotates_generations(tmp_path, bloom_storage_cls):
+    path = str(tmp_path / 'sent.jsonl')
+    storage = bloom_storage_cls(path, initial_capacity=100)
+    storage.mark_as_sent({'url': 'https://example.com/old'})
+
+    # Current generation is still inside the window: nothing rotates
+    assert storage.cleanup_old_entries(days=30) == 0
+
+    storage.meta['generation_started'] = (datetime.now() - timedelta(days=31)).isoformat()
+    assert storage.cleanup_old_entries(days=30) == 0  # previous generation was empty
+    storage.mark_as_sent({'url': 'https://example.com/new'})
+
+    # The old entry survives one rotation in the previous generation
+    reloaded = bloom_storage_cls(path, initial_capacity=100)
+    assert reloaded.is_sent('https://example.com/old')
+    assert reloaded.is_sent('https://example.com/new')
+
+    reloaded.meta['generation_started'] = (datetime.now() - timedelta(days=31)).isoformat()
+    assert reloaded.cleanup_old_entries(days=30) == 1
+    assert not reloaded.is_sent('https://example.com/old')
+    assert reloaded.is_sent('https://example.com/new')
+
+
+def test_bloom_storage_failed_write_keeps_previous_file(tmp_path, bloom_storage_cls):
+    path = str(tmp_path / 'sent.jsonl')
+    storage = bloom_storage_cls(path, initial_capacity=100)
+    storage.mark_as_sent({'url': 'https://example.com/a'})
+
+    def crash(f):
+        f.write(b'partial')
+        raise OSError("disk full")
+
+    with mock.patch.object(storage.current, 'tofile', crash):
+        with pytest.raises(OSError):
+            storage.mark_as_sent({'url': 'https://example.com/b'})
+
+    assert bloom_storage_cls(path, initial_capacity=100).is_sent('https://example.com/a')
@@ -0,0 +1,172 @@
+"""Tests for Telegram notifications."""
+
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+from telegram import Bot, MessageEntity
+from telegram.error import RetryAfter
+from telegram.request import HTTPXRequest
+
+from src.telegram_notifier import TelegramNotifier
+
+SENT_MESSAGE = {'message_id': 1, 'date': 0, 'chat': {'id': 1, 'type': 'private'}}
+
+
+@pytest.fixture
+def notifier():
+    notifier = TelegramNotifier('123:abc', '1', batch_window=0, retry_count=2, max_backoff=0.1)
+    # Keep tests fast: cut hung requests off quickly
+    notifier.bot.request.hard_deadline = 0.2
+    yield notifier
+    notifier.close()
+
+
+def test_rate_limit_wait_longer_than_deadline_is_honoured(notifier):
+    post_times = []
+
+    async def do_post(self, *args, **kwargs):
+        post_times.append(time.monotonic())
+        if len(post_times) == 1:
+            raise RetryAfter(1)
+        return SENT_MESSAGE
+
+    with mock.patch.object(Bot, '_do_post', do_post):
+        assert notifier.send_error_notification('boom') is True
+
+    assert len(post_times) == 2
+    assert post_times[1] - post_times[0] >= 1
+
+
+def test_hung_request_times_out_and_is_retried(notifier):
+    calls = []
+
+    async def hang(self, *args, **kwargs):
+        calls.append(1)
+        await asyncio.sleep(60)
+
+    with mock.patch.object(HTTPXRequest, 'do_request', hang):
+        assert notifier.send_digest([{'title': 'a', 'url': 'https://a.com'}]) is False
+
+    assert len(calls) == 2
+
+
+def test_close_shuts_down_http_pool():
+    notifier = TelegramNotifier('123:abc', '1')
+    client = notifier.bot.request._client
+
+    notifier.close()
+
+    assert client.is_closed
+
+
+def test_identical_digest_is_not_resent_in_a_later_minute(notifier):
+    articles = [{'title': 'A', 'url': 'https://example.com/a'}]
+
+    with mock.patch.object(Bot, '_do_post', mock.AsyncMock(return_value=SENT_MESSAGE)) as do_post:
+        assert notifier.send_digest(articles) is True
+        # A later run renders a different header time
+        notifier._last_time_key = None
+        with mock.patch.object(notifier, '_TIME_FMT', '%H:%M:%S.%f'):
+            assert notifier.send_digest([{'title': 'A', 'url': 'http://example.com/a/'}]) is True
+
+    assert do_post.await_count == 1
+
+
+def _entity_text(text, entity):
+    """Slice text by an entity's UTF-16 offset and length."""
+    utf16 = text.encode('utf-16-le')
+    return utf16[entity.offset * 2:(entity.offset + entity.length) * 2].decode('utf-16-le')
+
+
+def test_digest_entities_cover_header_and_titles(notifier):
+    articles = [
+        {'title': 'Émoji 🚀 <AI> & more', 'url': 'https://a.com/x'},
+        {'title': 'Math 𝕏 and 𝔸𝕀 models', 'url': 'https://b.com/y'},
+        {'title': 'Plain title', 'url': 'https://c.com/z'},
+    ]
+
+    text, entities = notifier.format_digest_message(articles)
+
+    header, *links = entities
+    assert header.type == MessageEntity.BOLD
+    assert header.offset == 0
+    assert _entity_text(text, header) == text.split('\n', 1)[0]
+
+    assert [entity.type for entity in links] == [MessageEntity.TEXT_LINK] * 3
+    assert [_entity_text(text, entity) for entity in links] == [a['title'] for a in articles]
+    assert [entity.url for entity in links] == [a['url'] for a in articles]
+
+
+def test_batcher_survives_a_digest_that_fails_to_format(notifier):
+    with mock.patch.object(notifier, 'format_digest_message', side_effect=[ValueError('bad article'), ('ok', [])]):
+        with mock.patch.object(Bot, '_do_post', mock.AsyncMock(return_value=SENT_MESSAGE)) as do_post:
+            assert notifier.send_digest_nowait([{'title': 'a', 'url': 'https://a.com'}]).result(timeout=5) is False
+            assert notifier.send_digest_nowait([{'title': 'b', 'url': 'https://b.com'}]).result(timeout=5) is True
+
+    assert do_post.await_count == 1
+
+
+def test_sync_send_gives_up_after_timeout(notifier):
+    notifier._RATE_LIMIT_MARGIN = 0
+    notifier.hard_deadline = 0.1
+    notifier.max_backoff = 0.1
+
+    async def never(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    with mock.patch.object(notifier, '_send_message_async', never):
+        start = time.monotonic()
+        assert notifier.send_error_notification('boom') is False
+
+    assert time.monotonic() - start < 5
+
+
+def test_close_sends_digest_already_in_flight():
+    notifier = TelegramNotifier('123:abc', '1', batch_window=0.3)
+
+    with mock.patch.object(Bot, '_do_post', mock.AsyncMock(return_value=SENT_MESSAGE)) as do_post:
+        future = notifier.send_digest_nowait([{'title': 'a', 'url': 'https://a.com'}])
+        notifier.close()
+        assert future.result(timeout=5) is True
+
+    assert do_post.await_count == 1
+
+
+def test_send_after_close_returns_false():
+    notifier = TelegramNotifier('123:abc', '1', batch_window=0)
+    notifier.close()
+
+    assert notifier.send_digest([{'title': 'a', 'url': 'https://a.com'}]) is False
+    assert notifier.send_error_notification('boom') is False
+
+
+def test_duplicate_urls_do_not_use_up_digest_slots(notifier):
+    articles = [
+        {'title': 'A', 'url': 'https://example.com/a'},
+        {'title': 'A again', 'url': 'http://example.com/a/'},
+        {'title': 'B', 'url': 'https://example.com/b'},
+        {'title': 'C', 'url': 'https://example.com/c'},
+    ]
+
+    with mock.patch.object(notifier, '_send_message_async', mock.AsyncMock(return_value=True)) as send:
+        assert notifier.send_digest(articles, max_articles=2) is True
+
+    message = send.await_args.args[0]
+    assert '1. A\n' in message
+    assert '2. B\n' in message
+    assert 'C' not in message
+
+
+def test_missing_titles_fall_back_to_untitled(notifier):
+    articles = [
+        {'title': None, 'url': 'https://example.com/a'},
+        {'title': '', 'url': 'https://example.com/b'},
+    ]
+
+    text, entities = notifier.format_digest_message(articles)
+
+    links = entities[1:]
+    assert [_entity_text(text, entity) for entity in links] == ['Untitled', 'Untitled']
+    assert all(entity.length > 0 for entity in links)
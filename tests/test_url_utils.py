@@ -0,0 +1,40 @@
+"""Tests for URL canonicalization."""
+
+import pytest
+
+from src.url_utils import canonical_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://example.com/story?utm_source=rss&utm_medium=feed', 'https://example.com/story'),
+    ('https://example.com/story?UTM_Campaign=x', 'https://example.com/story'),
+    ('https://example.com/story?fbclid=abc', 'https://example.com/story'),
+    ('https://example.com/story?gclid=abc&ref=hn&ref_src=twsrc', 'https://example.com/story'),
+    ('http://example.com/story', 'https://example.com/story'),
+    ('HTTPS://Example.COM/Story', 'https://example.com/Story'),
+    ('https://example.com/story/', 'https://example.com/story'),
+    ('https://example.com/story#comments', 'https://example.com/story'),
+    ('  https://example.com/story  ', 'https://example.com/story'),
+    ('https://example.com/', 'https://example.com'),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_other_query_parameters_are_kept_in_order():
+    url = 'https://example.com/watch?v=abc&utm_source=x&t=42&empty='
+    assert canonical_url(url) == 'https://example.com/watch?v=abc&t=42&empty='
+
+
+def test_variants_of_one_story_share_a_key():
+    variants = [
+        'http://example.com/story/?utm_source=twitter',
+        'https://EXAMPLE.com/story#top',
+        'https://example.com/story?fbclid=123',
+    ]
+    assert len({canonical_url(url) for url in variants}) == 1
+
+
+def test_different_stories_keep_distinct_keys():
+    assert canonical_url('https://example.com/story?id=1') != canonical_url('https://example.com/story?id=2')
+    assert canonical_url('https://example.com/a') != canonical_url('https://example.com/A')